@@ -1,10 +1,9 @@
 import os
 import requests
 from typing import Optional, Dict, List, Any
-from github import Github
 from dotenv import load_dotenv
-from jose import jwt, JWTError
 from datetime import datetime, timedelta
+from startup import lazy_import
 
 load_dotenv()
 
@@ -13,6 +12,17 @@ class GitHubService:
         self.client_id = os.getenv("GITHUB_CLIENT_ID")
         self.client_secret = os.getenv("GITHUB_CLIENT_SECRET")
         self.jwt_secret = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this")
+        self.session = requests.Session()
+    
+    def warmup(self) -> None:
+        """Load PyGithub and jose, and connect the OAuth session ahead of the first login"""
+        lazy_import("github")
+        lazy_import("jose.jwt")
+        self.session.head("https://github.com/login/oauth/access_token", timeout=5)
+    
+    def _github(self, access_token: str):
+        """Create a PyGithub client, importing the library on first use"""
+        return lazy_import("github").Github(access_token)
         
     def get_oauth_url(self, redirect_uri: str, state: str = None) -> str:
         """Generate GitHub OAuth authorization URL"""
@@ -40,7 +50,7 @@ class GitHubService:
         }
         
         headers = {"Accept": "application/json"}
-        response = requests.post(url, data=data, headers=headers)
+        response = self.session.post(url, data=data, headers=headers)
         
         if response.status_code == 200:
             token_data = response.json()
@@ -50,7 +60,7 @@ class GitHubService:
     def get_user_info(self, access_token: str) -> Optional[Dict[str, Any]]:
         """Get user information from GitHub"""
         try:
-            g = Github(access_token)
+            g = self._github(access_token)
             user = g.get_user()
             return {
                 "login": user.login,
@@ -66,7 +76,7 @@ class GitHubService:
     def get_user_repositories(self, access_token: str) -> List[Dict[str, Any]]:
         """Get user's repositories"""
         try:
-            g = Github(access_token)
+            g = self._github(access_token)
             user = g.get_user()
             repos = []
             
@@ -89,7 +99,7 @@ class GitHubService:
     def get_repository_contents(self, access_token: str, owner: str, repo: str, path: str = "") -> List[Dict[str, Any]]:
         """Get repository file/folder contents"""
         try:
-            g = Github(access_token)
+            g = self._github(access_token)
             repository = g.get_repo(f"{owner}/{repo}")
             contents = repository.get_contents(path)
             
@@ -119,7 +129,7 @@ class GitHubService:
     def get_file_content(self, access_token: str, owner: str, repo: str, path: str) -> Optional[str]:
         """Get content of a specific file"""
         try:
-            g = Github(access_token)
+            g = self._github(access_token)
             repository = g.get_repo(f"{owner}/{repo}")
             file_content = repository.get_contents(path)
             
@@ -154,12 +164,14 @@ class GitHubService:
             "github_token": access_token,
             "exp": datetime.utcnow() + timedelta(days=7)
         }
+        jwt = lazy_import("jose.jwt")
         return jwt.encode(payload, self.jwt_secret, algorithm="HS256")
     
     def decode_jwt_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Decode JWT token and return payload"""
+        jwt = lazy_import("jose.jwt")
         try:
             payload = jwt.decode(token, self.jwt_secret, algorithms=["HS256"])
             return payload
-        except JWTError:
+        except jwt.JWTError:
             return None
\ No newline at end of file
@@ -1,18 +1,32 @@
-from fastapi import FastAPI, HTTPException, Request, Response, Depends, Cookie
+from fastapi import FastAPI, HTTPException, Request, Response, Depends, Cookie, Header
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import FileResponse, RedirectResponse, JSONResponse
 from pydantic import BaseModel
 from openai_service import OpenAIService
 from github_service import GitHubService
+import startup
+import profiling
 from typing import Optional, List, Dict, Any
 import os
 import uuid
+import secrets
+from contextlib import asynccontextmanager
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the OpenAI and GitHub services in the background once the server starts"""
+    tasks = {}
+    if startup.prewarm_enabled():
+        tasks = {"openai": openai_service.warmup, "github": github_service.warmup}
+    startup.start_warmup(tasks)
+    yield
 
 app = FastAPI(
     title="AI Code Commenter",
     description="An API for automatically adding comments and docstrings to source code.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -23,10 +37,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in request profiling (see PROFILE_* environment variables)
+if profiling.enabled():
+    app.middleware("http")(profiling.profiling_middleware)
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Report whether startup warmup has finished, along with startup timings"""
+    report = startup.report()
+    if not report["ready"]:
+        return JSONResponse(status_code=503, content={"status": "warming", **report})
+    return {"status": "ready", **report}
+
 # Request/Response models
 class CodeAnnotationRequest(BaseModel):
     code: str
@@ -56,9 +82,10 @@ class GitHubFileRequest(BaseModel):
     language: str = "python"
     comment_level: str = "standard"
 
-# Initialize services
-openai_service = OpenAIService()
-github_service = GitHubService()
+# Initialize services (heavy client libraries are imported on first use)
+with startup.timed("init:services"):
+    openai_service = OpenAIService()
+    github_service = GitHubService()
 
 @app.post("/annotate", response_model=CodeAnnotationResponse)
 async def annotate_code(request: CodeAnnotationRequest):
@@ -197,9 +224,10 @@ async def annotate_github_file(
         access_token = current_user["github_token"]
         
         # Get file content from GitHub
-        file_content = github_service.get_file_content(
-            access_token, request.owner, request.repo, request.path
-        )
+        with profiling.span("github_fetch"):
+            file_content = github_service.get_file_content(
+                access_token, request.owner, request.repo, request.path
+            )
         
         if not file_content:
             raise HTTPException(status_code=404, detail="File not found or cannot be read")
@@ -222,6 +250,28 @@ async def annotate_github_file(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error annotating GitHub file: {str(e)}")
 
+# Admin endpoints
+async def require_admin(x_admin_token: str = Header(None)):
+    """Check the admin token; admin endpoints are disabled when ADMIN_TOKEN is unset"""
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not secrets.compare_digest(x_admin_token or "", admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+@app.get("/admin/traces", dependencies=[Depends(require_admin)])
+async def list_traces():
+    """List captured request traces, most recent first"""
+    return {"enabled": profiling.enabled(), "traces": profiling.get_traces()}
+
+@app.get("/admin/traces/{trace_id}", dependencies=[Depends(require_admin)])
+async def get_trace(trace_id: str):
+    """Get a captured trace with its span breakdown and profile"""
+    trace = profiling.get_trace(trace_id)
+    if not trace:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return trace
+
 # Mount static files for frontend assets
 app.mount("/static", StaticFiles(directory="frontend"), name="static")
 
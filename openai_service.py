@@ -1,17 +1,33 @@
-import openai
 import os
+import threading
 from typing import Optional
 from dotenv import load_dotenv
+from startup import lazy_import
+from profiling import span
 
 load_dotenv()
 
 class OpenAIService:
     def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            self.client = openai.OpenAI(api_key=api_key)
-        else:
-            self.client = None
+        self.api_key = os.getenv("OPENAI_API_KEY")
+        self._client = None
+        self._client_lock = threading.Lock()
+    
+    @property
+    def client(self):
+        """OpenAI client, created on first use so the openai import stays off the startup path"""
+        if self._client is None and self.api_key:
+            with self._client_lock:
+                if self._client is None:
+                    openai = lazy_import("openai")
+                    self._client = openai.OpenAI(api_key=self.api_key)
+        return self._client
+    
+    def warmup(self) -> None:
+        """Create the OpenAI client and make a cheap API call ahead of the first annotation"""
+        if self.client:
+            # Short timeout and no retries so an unreachable API can't hold /ready at 503
+            self.client.with_options(timeout=5, max_retries=0).models.list()
     
     def annotate_code(self, code: str, language: str = "python", comment_level: str = "standard") -> str:
         """
@@ -26,38 +42,41 @@ class OpenAIService:
             str: The annotated code with comments and docstrings
         """
         
-        prompt = self._create_annotation_prompt(code, language, comment_level)
+        with span("prompt_build"):
+            prompt = self._create_annotation_prompt(code, language, comment_level)
         
         if not self.client:
             raise Exception("OpenAI API key not configured")
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-5-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert code reviewer and documentation specialist. Your task is to add meaningful inline comments and docstrings to source code to improve readability and maintainability."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_completion_tokens=2000,
-                # temperature=0.3
-            )
-            
-            annotated_code = response.choices[0].message.content.strip()
+            with span("model_call"):
+                response = self.client.chat.completions.create(
+                    model="gpt-5-mini",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are an expert code reviewer and documentation specialist. Your task is to add meaningful inline comments and docstrings to source code to improve readability and maintainability."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    max_completion_tokens=2000,
+                    # temperature=0.3
+                )
             
-            # Remove markdown code block formatting if present
-            if annotated_code.startswith("```"):
-                lines = annotated_code.split("\n")
-                if lines[0].startswith("```"):
-                    lines = lines[1:]
-                if lines[-1] == "```":
-                    lines = lines[:-1]
-                annotated_code = "\n".join(lines)
+            with span("post_processing"):
+                annotated_code = response.choices[0].message.content.strip()
+                
+                # Remove markdown code block formatting if present
+                if annotated_code.startswith("```"):
+                    lines = annotated_code.split("\n")
+                    if lines[0].startswith("```"):
+                        lines = lines[1:]
+                    if lines[-1] == "```":
+                        lines = lines[:-1]
+                    annotated_code = "\n".join(lines)
             
             return annotated_code
             
@@ -0,0 +1,177 @@
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from fastapi import Request
+
+load_dotenv()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+# Fraction of requests to trace (0.0 - 1.0)
+SAMPLE_RATE = _env_float("PROFILE_SAMPLE_RATE", 0.0)
+# Any request slower than this is kept, sampled or not (0 disables)
+SLOW_REQUEST_MS = _env_float("PROFILE_SLOW_MS", 0.0)
+# Number of traces kept for /admin/traces
+TRACE_LIMIT = int(_env_float("PROFILE_TRACE_LIMIT", 50))
+# Attach sampling-profiler stacks to sampled requests
+SAMPLER_ENABLED = os.getenv("PROFILE_SAMPLER", "false").lower() in ("1", "true", "yes")
+# At least 1ms, so the sampler can't spin against the event loop thread for the GIL
+SAMPLER_INTERVAL = max(_env_float("PROFILE_SAMPLER_INTERVAL_MS", 5.0), 1.0) / 1000
+
+# Probes and static pages would otherwise crowd API traces out of the buffer
+UNTRACED_PATHS = ("/health", "/ready", "/")
+UNTRACED_PREFIXES = ("/admin", "/static")
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_traces: deque = deque(maxlen=max(TRACE_LIMIT, 1))
+_traces_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    """Profiling is opt-in: on only when a sample rate or slow threshold is configured"""
+    return SAMPLE_RATE > 0 or SLOW_REQUEST_MS > 0
+
+
+class Trace:
+    def __init__(self, method: str, path: str, sampled: bool):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.sampled = sampled
+        self.slow = False
+        self.started_at = datetime.now(timezone.utc)
+        self.start = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.profile: Optional[List[Dict[str, Any]]] = None
+        self.status_code: Optional[int] = None
+        self.duration_ms = 0.0
+
+    def to_dict(self, include_details: bool = True) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "sampled": self.sampled,
+            "slow": self.slow,
+        }
+        if include_details:
+            data["spans"] = self.spans
+            data["profile"] = self.profile
+        return data
+
+
+@contextmanager
+def span(name: str):
+    """Time a step of the current request; does nothing when the request isn't traced"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        trace.spans.append({
+            "name": name,
+            "start_ms": round((start - trace.start) * 1000, 1),
+            "duration_ms": round((end - start) * 1000, 1),
+        })
+
+
+class StackSampler:
+    """Samples the call stack of one thread at a fixed interval"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Stop sampling and return the most frequent stacks, innermost frame last"""
+        self._stop.set()
+        self._thread.join()
+        return [{"stack": stack, "samples": count} for stack, count in self.stacks.most_common(limit)]
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+
+async def profiling_middleware(request: Request, call_next):
+    """Trace a sample of requests, keeping sampled and slow ones in the ring buffer"""
+    path = request.url.path
+    if path in UNTRACED_PATHS or path.startswith(UNTRACED_PREFIXES):
+        return await call_next(request)
+
+    trace = Trace(request.method, path, sampled=random.random() < SAMPLE_RATE)
+    token = _current_trace.set(trace)
+
+    # Handlers run blocking service calls on the event loop thread, so sample that thread.
+    # Concurrent requests on the same loop will show up in each other's profiles.
+    sampler = None
+    if trace.sampled and SAMPLER_ENABLED:
+        sampler = StackSampler(threading.get_ident(), SAMPLER_INTERVAL)
+        sampler.start()
+
+    try:
+        response = await call_next(request)
+        trace.status_code = response.status_code
+        return response
+    finally:
+        _current_trace.reset(token)
+        trace.duration_ms = round((time.perf_counter() - trace.start) * 1000, 1)
+        if sampler:
+            trace.profile = sampler.stop()
+        trace.slow = SLOW_REQUEST_MS > 0 and trace.duration_ms >= SLOW_REQUEST_MS
+        if trace.sampled or trace.slow:
+            with _traces_lock:
+                _traces.append(trace)
+
+
+def get_traces() -> List[Dict[str, Any]]:
+    """Return trace summaries, most recent first"""
+    with _traces_lock:
+        traces = list(_traces)
+    return [trace.to_dict(include_details=False) for trace in reversed(traces)]
+
+
+def get_trace(trace_id: str) -> Optional[Dict[str, Any]]:
+    """Return one trace with its span breakdown and profile"""
+    with _traces_lock:
+        for trace in _traces:
+            if trace.id == trace_id:
+                return trace.to_dict()
+    return None
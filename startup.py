@@ -0,0 +1,87 @@
+import importlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
+
+# Seconds spent per startup step, e.g. {"import:openai": 0.412, "init:services": 0.001}
+_timings: Dict[str, float] = {}
+_timings_lock = threading.Lock()
+
+_started_at = time.perf_counter()
+_ready = threading.Event()
+_failed_warmups: List[str] = []
+
+
+def _record(name: str, seconds: float) -> None:
+    with _timings_lock:
+        _timings.setdefault(name, seconds)
+
+
+@contextmanager
+def timed(name: str):
+    """Record how long the wrapped block takes under the given name"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+def lazy_import(module_name: str) -> Any:
+    """Import a module on first use and record how long the import took"""
+    with timed(f"import:{module_name}"):
+        return importlib.import_module(module_name)
+
+
+def prewarm_enabled() -> bool:
+    """Connection pre-warming is on unless PREWARM_CONNECTIONS is set to a false value"""
+    return os.getenv("PREWARM_CONNECTIONS", "true").lower() not in ("0", "false", "no")
+
+
+def start_warmup(tasks: Dict[str, Callable[[], None]]) -> None:
+    """Run warmup tasks in a background thread and mark the app ready when they finish"""
+    if not tasks:
+        _ready.set()
+        print(format_report())
+        return
+
+    def run():
+        for name, task in tasks.items():
+            try:
+                with timed(f"warmup:{name}"):
+                    task()
+            except Exception as e:
+                # A failed warmup only costs latency on the first real request
+                _failed_warmups.append(name)
+                print(f"Warmup '{name}' failed: {e}")
+        _ready.set()
+        print(format_report())
+
+    threading.Thread(target=run, name="warmup", daemon=True).start()
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def report() -> Dict[str, Any]:
+    """Return the startup timing report"""
+    with _timings_lock:
+        timings = {name: round(seconds * 1000, 1) for name, seconds in _timings.items()}
+    return {
+        "ready": is_ready(),
+        "uptime_ms": round((time.perf_counter() - _started_at) * 1000, 1),
+        "timings_ms": timings,
+        "failed_warmups": list(_failed_warmups),
+    }
+
+
+def format_report() -> str:
+    """Format the startup timing report for the server log"""
+    data = report()
+    lines: List[str] = ["Startup timings:"]
+    for name, ms in sorted(data["timings_ms"].items(), key=lambda item: -item[1]):
+        lines.append(f"  {name:<32} {ms:>8.1f} ms")
+    return "\n".join(lines)